@@ -0,0 +1,85 @@
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlparse
+
+import pytest
+from PIL import Image
+
+# main.py reads its configuration at import time: keep its database and rate card out of
+# the repo and stop the background threads from doing work during the tests
+_data_dir = tempfile.mkdtemp(prefix='listing-tests-')
+os.environ.setdefault('DATA_DIR', _data_dir)
+os.environ.setdefault('RATE_CARD_PATH', os.path.join(_data_dir, 'rate_cards.json'))
+os.environ.setdefault('RATE_CARD_RELOAD_INTERVAL', '0')
+os.environ.setdefault('EXPERIMENT_FLUSH_INTERVAL', '0')
+os.environ.setdefault('KEYWORD_COLLECTION_INTERVAL', '0')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def local_gst_rates(monkeypatch):
+    """Resolve HSN codes from the local table instead of the ClearTax API"""
+    monkeypatch.setattr(main, 'get_gst_rate_from_hsn_api', main.get_gst_rate_from_hsn_local)
+
+
+@pytest.fixture
+def client():
+    return main.app.test_client()
+
+
+class StubImageHandler(BaseHTTPRequestHandler):
+    """Image generator stub: /prompt/<text> returns a PNG; 'slow' in the prompt delays it,
+    'fail' makes it a 503"""
+
+    def do_GET(self):
+        server = self.server
+        prompt = unquote(urlparse(self.path).path)
+        with server.lock:
+            server.requests.append((time.monotonic(), prompt))
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            time.sleep(server.delay + (0.3 if 'slow' in prompt else 0))
+            if 'fail' in prompt:
+                self.send_response(503)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', server.content_type)
+            self.send_header('Content-Length', str(len(server.body)))
+            self.end_headers()
+            self.wfile.write(server.body)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def image_server(monkeypatch):
+    """Local stand-in for IMAGE_GENERATOR_BASE_URL"""
+    buffer = io.BytesIO()
+    Image.new('RGB', (8, 8), 'red').save(buffer, 'PNG')
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubImageHandler)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.in_flight = server.max_in_flight = 0
+    server.delay = 0.0
+    server.body, server.content_type = buffer.getvalue(), 'image/png'
+    server.base_url = f'http://127.0.0.1:{server.server_address[1]}'
+    monkeypatch.setattr(main, 'IMAGE_GENERATOR_BASE_URL', server.base_url)
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
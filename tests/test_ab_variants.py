@@ -0,0 +1,80 @@
+import time
+
+import main
+
+TITLE = 'Cotton Kurta for Women'
+DESCRIPTION = 'A breathable cotton kurta for daily wear.'
+BULLETS = ['Made from 100% breathable cotton', 'Hand block printed motifs', 'Machine washable, colour fast',
+           'Three quarter sleeves with side slits', 'Available in sizes XS to XXL', 'Pairs with leggings or palazzos']
+
+
+def test_many_bullets_stay_fast_and_keep_every_bullet():
+    bullets = [f'{bullet} ({i})' for i, bullet in enumerate(BULLETS * 5)]
+
+    started = time.monotonic()
+    result = main.create_ab_test_variations(TITLE, DESCRIPTION, bullets)
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 1
+    assert result['varied_bullets'] == main.AB_MAX_VARIED_BULLETS
+    # Stops once the bound can no longer beat the candidates, well before the cap
+    assert result['combinations_evaluated'] < min(result['total_combinations'], main.AB_TEST_MAX_COMBINATIONS)
+    for combination in result['combinations']:
+        assert len(combination['bulletPoints']) == len(bullets)
+        assert combination['bulletPoints'][main.AB_MAX_VARIED_BULLETS:] == bullets[main.AB_MAX_VARIED_BULLETS:]
+
+
+def test_total_combinations_is_exact():
+    result = main.create_ab_test_variations(TITLE, DESCRIPTION, BULLETS)
+    rotations = len(main.AB_POWER_WORDS)
+    expected = (len(result['title_variations']) + 1) * (len(result['description_variations']) + 1) * (rotations + 1) - 1
+    assert result['total_combinations'] == expected
+    assert isinstance(result['total_combinations'], int)
+
+
+def test_top_combinations_are_not_near_duplicates():
+    combinations = main.create_ab_test_variations(TITLE, DESCRIPTION, BULLETS)['combinations']
+    assert len(combinations) == main.AB_TEST_TOP_K
+
+    # No two picks only move the same power words between bullets
+    edits = [(combination['title'], combination['description'],
+              frozenset().union(*map(main._power_words_in, combination['bulletPoints'])))
+             for combination in combinations]
+    assert len(set(edits)) == len(edits)
+
+
+def test_each_varied_bullet_gets_a_different_power_word():
+    for combination in main.create_ab_test_variations(TITLE, DESCRIPTION, BULLETS)['combinations']:
+        varied = combination['bulletPoints'][:main.AB_MAX_VARIED_BULLETS]
+        words = [word for text in varied for word in main._power_words_in(text)]
+        assert len(words) == len(set(words))
+
+
+def test_headroom_not_length_drives_the_score():
+    short = 'Premium Cotton Kurta'
+    padded = short + ' for Women' + ' with embroidery' * 10
+    assert len(padded) <= main.LISTING_TITLE_MAX_CHARS
+    assert main._score_text(TITLE, padded, main.LISTING_TITLE_MAX_CHARS)[0] < main._score_text(TITLE, short, main.LISTING_TITLE_MAX_CHARS)[0]
+    assert main._score_text(TITLE, 'x' * (main.LISTING_TITLE_MAX_CHARS + 1), main.LISTING_TITLE_MAX_CHARS)[0] == -1.0
+
+
+def test_over_limit_variants_are_reported():
+    bullet = 'b' * (main.LISTING_BULLET_MAX_CHARS - 3)
+    result = main.create_ab_test_variations(TITLE, DESCRIPTION, [bullet], top_k=100)
+    changed = [combination for combination in result['combinations'] if 'bullet 1' in combination['changed']]
+    assert changed
+    for combination in changed:
+        assert combination['violations'] == [f'bullet 1 exceeds {main.LISTING_BULLET_MAX_CHARS} characters '
+                                             f'({len(combination["bulletPoints"][0])})']
+    assert result['combinations'][0]['violations'] == []
+
+
+def test_route_rejects_bad_top_k(client):
+    response = client.post('/api/create-ab-test', json={'title': TITLE, 'description': DESCRIPTION,
+                                                        'bulletPoints': BULLETS, 'topK': 0})
+    assert response.status_code == 400
+
+    response = client.post('/api/create-ab-test', json={'title': TITLE, 'description': DESCRIPTION,
+                                                        'bulletPoints': BULLETS, 'topK': 3})
+    assert response.status_code == 200
+    assert len(response.get_json()['data']['combinations']) == 3
@@ -0,0 +1,99 @@
+import pytest
+
+import main
+
+
+def test_msprt_needs_minimum_samples():
+    assert main.msprt_p_value(10, main.EXPERIMENT_MIN_SAMPLES - 1, 90, 1000) == 1.0
+
+
+def test_msprt_equal_rates_are_not_significant():
+    assert main.msprt_p_value(100, 1000, 100, 1000) == 1.0
+
+
+def test_msprt_p_value_falls_with_effect_and_sample_size():
+    small = main.msprt_p_value(50, 1000, 70, 1000)
+    larger_effect = main.msprt_p_value(50, 1000, 100, 1000)
+    more_data = main.msprt_p_value(500, 10000, 700, 10000)
+    assert 0 < larger_effect < small <= 1
+    assert more_data < small
+    assert more_data < 0.05
+
+
+def test_msprt_is_symmetric():
+    assert main.msprt_p_value(40, 2000, 90, 2000) == pytest.approx(main.msprt_p_value(90, 2000, 40, 2000))
+
+
+def test_msprt_clamps_successes_to_trials():
+    assert main.msprt_p_value(500, 150, 10, 200) == main.msprt_p_value(150, 150, 10, 200)
+    assert main.msprt_p_value(-5, 150, 10, 200) == main.msprt_p_value(0, 150, 10, 200)
+
+
+def test_beta_posteriors_summaries():
+    posteriors = main.beta_posteriors([30, 60], [1000, 1000], draws=20000)
+    # Posterior mean of Beta(1 + s, 1 + n - s)
+    assert posteriors[0]['mean'] == pytest.approx(31 / 1002, abs=1e-5)
+    assert posteriors[1]['mean'] == pytest.approx(61 / 1002, abs=1e-5)
+    for posterior in posteriors:
+        lower, upper = posterior['credibleInterval']
+        assert lower < posterior['mean'] < upper
+    assert sum(posterior['probabilityBest'] for posterior in posteriors) == pytest.approx(1)
+    assert posteriors[1]['probabilityBest'] > 0.99
+    assert posteriors[1]['expectedLoss'] < posteriors[0]['expectedLoss']
+
+
+def test_beta_posteriors_are_reproducible():
+    assert main.beta_posteriors([5, 7, 9], [50, 50, 50], seed=3) == main.beta_posteriors([5, 7, 9], [50, 50, 50], seed=3)
+
+
+def test_beta_posteriors_clamp_inconsistent_counts():
+    posteriors = main.beta_posteriors([12, -1], [10, 10])
+    assert posteriors[0]['mean'] == pytest.approx(11 / 12, abs=1e-5)
+    assert posteriors[1]['mean'] == pytest.approx(1 / 12, abs=1e-5)
+
+
+def test_experiment_results_survive_conversions_without_clicks(client):
+    created = client.post('/api/experiments', json={'variants': [{'name': 'A'}, {'name': 'B'}]}).get_json()
+    experiment_id = created['data']['experimentId']
+    variants = [variant['variantId'] for variant in created['data']['variants']]
+    events = [
+        {'experimentId': experiment_id, 'variantId': variants[1], 'type': 'conversion', 'count': 500},
+        {'experimentId': experiment_id, 'variantId': variants[1], 'type': 'click', 'count': 300},
+        {'experimentId': experiment_id, 'variantId': variants[0], 'type': 'impression', 'count': 200},
+        {'experimentId': experiment_id, 'variantId': variants[1], 'type': 'impression', 'count': 150}
+    ]
+    assert client.post('/api/experiments/events', json={'events': events}).status_code == 202
+
+    response = client.get(f'/api/experiments/{experiment_id}')
+    assert response.status_code == 200
+    for variant in response.get_json()['data']['variants']:
+        assert variant['ctr'] is None or 0 <= variant['ctr'] <= 1
+        assert variant['conversionRate'] is None or 0 <= variant['conversionRate'] <= 1
+
+
+def test_failed_flush_keeps_the_batch(client, monkeypatch):
+    created = client.post('/api/experiments', json={'variants': [{'name': 'A'}, {'name': 'B'}]}).get_json()
+    experiment_id = created['data']['experimentId']
+    variants = [variant['variantId'] for variant in created['data']['variants']]
+    main.record_experiment_events([{'experimentId': experiment_id, 'variantId': variant, 'type': 'impression', 'count': 40}
+                                   for variant in variants])
+
+    # Fails after the event log and counters were written, before the commit
+    def failing_p_value(*args, **kwargs):
+        raise RuntimeError('database is locked')
+    monkeypatch.setattr(main, 'msprt_p_value', failing_p_value)
+    with pytest.raises(RuntimeError):
+        main.flush_experiment_events()
+    assert len(main._experiment_event_buffer) == 2
+
+    monkeypatch.undo()
+    results = main.get_experiment_results(experiment_id)
+    assert [variant['impressions'] for variant in results['variants']] == [40, 40]
+    assert main.get_db().execute('SELECT COUNT(*) FROM experiment_events WHERE experiment_id = ?',
+                                 (experiment_id,)).fetchone()[0] == 2
+
+
+def test_duplicate_variant_ids_are_rejected(client):
+    response = client.post('/api/experiments', json={'variants': [{'id': 'a', 'name': 'A'}, {'id': 'a', 'name': 'B'}]})
+    assert response.status_code == 400
+    assert 'Duplicate variant ids: a' in response.get_json()['error']
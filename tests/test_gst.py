@@ -0,0 +1,87 @@
+import csv
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import main
+
+
+def test_gst_batch_matches_scalar():
+    rng = np.random.default_rng(7)
+    hsn_codes = ['6109', '8517', '0401', '9403', '9999', '12', '']
+    states = ['Delhi', 'Mumbai', 'Karnataka']
+    orders = [{
+        'orderId': f'O{i}',
+        'costPrice': float(rng.choice([100, 4999.99, 5000.01, 49999, 50001, 123456.78])),
+        'hsnCode': hsn_codes[i % len(hsn_codes)],
+        'stateFrom': states[i % 3],
+        'stateTo': states[(i // 3) % 3]
+    } for i in range(60)]
+
+    batch = main.calculate_comprehensive_gst_batch(orders)
+    assert list(batch['orderId']) == [order['orderId'] for order in orders]
+
+    for order, row in zip(orders, batch.to_dict('records')):
+        expected = main.calculate_comprehensive_gst(order['costPrice'], order['hsnCode'], order['stateFrom'], order['stateTo'])
+        for column in ('gstRate', 'gstAmount', 'cgst', 'sgst', 'igst', 'tcs', 'tds', 'totalTax', 'priceWithTax'):
+            assert row[column] == pytest.approx(expected[column]), column
+        assert row['taxType'] == expected['taxType']
+        assert row['gstDescription'] == expected['gstDescription']
+
+
+def test_gst_batch_reuses_rate_cache_across_chunks(monkeypatch):
+    cache = {}
+    main.calculate_comprehensive_gst_batch([{'costPrice': 100, 'hsnCode': '6109'}], cache)
+
+    def fail(hsn_code):
+        raise AssertionError(f'{hsn_code} looked up again')
+    monkeypatch.setattr(main, 'get_gst_rate_from_hsn', fail)
+    chunk = main.calculate_comprehensive_gst_batch(pd.DataFrame({'costPrice': [200.0], 'hsnCode': ['6109']}), cache)
+    assert chunk.loc[0, 'gstAmount'] == pytest.approx(200 * main.get_gst_rate_from_hsn_local('6109')[0])
+
+
+ORDER_BOOK = ('orderId,costPrice,hsnCode,note\n'
+              '1,100,6109,\n'
+              '2,250.5,8517,\n'
+              'A-3,5000.01,0401,gift wrap\n'
+              '4,99,9403,\n')
+
+
+def _upload(client, body, output_format):
+    return client.post('/api/calculate-comprehensive-gst/batch', content_type='multipart/form-data',
+                       data={'format': output_format, 'file': (io.BytesIO(body.encode()), 'orders.csv')})
+
+
+def test_parquet_chunks_share_one_schema(client, monkeypatch):
+    pq = pytest.importorskip('pyarrow.parquet')
+    # Two-row chunks: orderId is numeric and note empty in the first, text in the second
+    monkeypatch.setattr(main, 'GST_BATCH_CHUNK_ROWS', 2)
+
+    response = _upload(client, ORDER_BOOK, 'parquet')
+    assert response.status_code == 200
+
+    table = pq.read_table(io.BytesIO(response.data))
+    assert str(table.schema.field('orderId').type) == 'string'
+    assert str(table.schema.field('note').type) == 'string'
+    assert str(table.schema.field('gstAmount').type) == 'double'
+    assert table.column('orderId').to_pylist() == ['1', '2', 'A-3', '4']
+    assert table.column('note').to_pylist() == [None, None, 'gift wrap', None]
+    assert table.num_rows == 4
+
+
+def test_unreadable_upload_releases_its_scratch_file(client):
+    live_files = main.get_scratch_usage()['liveFiles']
+    response = _upload(client, '', 'csv')
+    assert response.status_code == 500
+    assert main.get_scratch_usage()['liveFiles'] == live_files
+
+
+def test_csv_stream_closes_the_upload_when_done(client):
+    live_files = main.get_scratch_usage()['liveFiles']
+    response = _upload(client, ORDER_BOOK, 'csv')
+    rows = list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+    response.close()
+    assert len(rows) == 5
+    assert main.get_scratch_usage()['liveFiles'] == live_files
@@ -0,0 +1,31 @@
+import random
+
+import main
+
+
+def test_bktree_range_queries_match_brute_force():
+    rng = random.Random(11)
+    hashes = [rng.getrandbits(64) for _ in range(300)]
+    # Near neighbours and exact repeats of a few hashes
+    for base in hashes[:20]:
+        hashes.append(base ^ (1 << rng.randrange(64)))
+        hashes.append(base)
+
+    tree = main.BKTree()
+    for index, hash_value in enumerate(hashes):
+        tree.add(hash_value, index)
+    assert len(tree) == len(hashes)
+
+    for query in hashes[:25] + [rng.getrandbits(64) for _ in range(10)]:
+        for max_distance in (0, 1, 5, 20):
+            expected = sorted((bin(query ^ hash_value).count('1'), index)
+                              for index, hash_value in enumerate(hashes)
+                              if bin(query ^ hash_value).count('1') <= max_distance)
+            matches = tree.search(query, max_distance)
+            assert sorted(matches) == expected
+            assert [distance for distance, _ in matches] == sorted(distance for distance, _ in matches)
+
+
+def test_bktree_empty():
+    assert main.BKTree().search(0, 64) == []
+    assert len(main.BKTree()) == 0
@@ -0,0 +1,95 @@
+import socket
+import time
+
+import main
+
+
+def test_generated_images_are_stored_by_id(image_server, client):
+    images = list(main.iter_generated_images(['red shirt', 'blue shirt'], rate_per_second=0))
+
+    assert sorted(image['index'] for image in images) == [0, 1]
+    for image in images:
+        assert image['status'] == 'generated'
+        assert image['source_url'].startswith(image_server.base_url + '/prompt/')
+        response = client.get(image['image_url'])
+        assert response.status_code == 200
+        assert response.data == image_server.body
+        assert response.mimetype == 'image/png'
+
+
+def test_fetches_run_concurrently_up_to_the_pool_size(image_server):
+    image_server.delay = 0.2
+    prompts = [f'shirt {i}' for i in range(6)]
+
+    started = time.monotonic()
+    images = list(main.iter_generated_images(prompts, max_workers=3, rate_per_second=0))
+    elapsed = time.monotonic() - started
+
+    assert all(image['status'] == 'generated' for image in images)
+    assert image_server.max_in_flight == 3
+    # Two waves of three rather than six sequential requests
+    assert elapsed < 6 * image_server.delay
+
+
+def test_rate_limiter_spaces_requests_after_the_burst(image_server):
+    prompts = [f'shirt {i}' for i in range(6)]
+    list(main.iter_generated_images(prompts, max_workers=2, rate_per_second=10))
+
+    request_times = sorted(request_time for request_time, _ in image_server.requests)
+    assert len(request_times) == 6
+    # Burst of two, then the remaining four at 10 per second
+    assert request_times[-1] - request_times[0] >= 0.35
+
+
+def test_images_are_yielded_in_completion_order(image_server):
+    images = list(main.iter_generated_images(['slow shirt', 'quick shirt'], rate_per_second=0))
+    assert [image['index'] for image in images] == [1, 0]
+
+
+def test_generate_actual_product_images_reports_in_prompt_order(image_server):
+    result = main.generate_actual_product_images('slow shirt', 'Brand', 'Apparel')
+    assert [image['index'] for image in result['generated_images']] == [0, 1, 2]
+    assert result['total_generated'] == 3
+
+
+def test_failed_fetches_are_reported_per_image(image_server):
+    images = sorted(main.iter_generated_images(['fail shirt', 'good shirt'], rate_per_second=0),
+                    key=lambda image: image['index'])
+
+    assert images[0]['status'] == 'failed'
+    assert images[0]['error'] == 'HTTP 503'
+    assert 'image_id' not in images[0]
+    assert images[1]['status'] == 'generated'
+
+
+def test_unreachable_generator_fails_every_image():
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        closed_port = probe.getsockname()[1]
+
+    images = list(main.iter_generated_images(['shirt', 'hat'], base_url=f'http://127.0.0.1:{closed_port}',
+                                             rate_per_second=0))
+    assert [image['status'] for image in images] == ['failed', 'failed']
+    assert all(image['error'] for image in images)
+
+
+def test_upstream_html_is_not_stored(image_server):
+    image_server.body = b'<html><script>alert(document.cookie)</script></html>'
+    image_server.content_type = 'text/html'
+
+    [image] = main.iter_generated_images(['shirt'], rate_per_second=0)
+    assert image['status'] == 'failed'
+    assert image['error'] == 'Response is not an image'
+    assert main.fetch_placeholder_image(image_server.base_url + '/prompt/shirt') is None
+
+
+def test_stored_type_is_sniffed_not_taken_from_the_header(image_server, client):
+    image_server.content_type = 'text/html'
+
+    [image] = main.iter_generated_images(['shirt'], rate_per_second=0)
+    response = client.get(image['image_url'])
+    assert response.mimetype == 'image/png'
+    assert response.headers['X-Content-Type-Options'] == 'nosniff'
+
+    image_id = main.fetch_placeholder_image(image_server.base_url + '/prompt/shirt')
+    assert client.get(f'/api/images/{image_id}').mimetype == 'image/png'
@@ -0,0 +1,75 @@
+import io
+
+from PIL import Image
+
+import main
+
+
+def _jpeg(width, height, orientation=None):
+    """A grey JPEG with a black bar along its stored top edge"""
+    image = Image.new('RGB', (width, height), (128, 128, 128))
+    image.paste((0, 0, 0), (0, 0, width, height // 10))
+    exif = Image.Exif()
+    if orientation:
+        exif[0x0112] = orientation
+    buffer = io.BytesIO()
+    image.save(buffer, format='JPEG', quality=95, exif=exif)
+    return buffer.getvalue()
+
+
+def _variant(result, platform, slot):
+    return next(v for v in result['variants'] if v['platform'] == platform and v['slot'] == slot)
+
+
+def _content_box(variant):
+    """Bounding box of the non-white pixels on the rendered canvas"""
+    image = Image.open(io.BytesIO(variant['content'])).convert('L')
+    return image.point(lambda value: 255 if value < 240 else 0).getbbox()
+
+
+def test_exif_orientation_is_applied_before_resizing():
+    # Stored landscape with the bar on top; orientation 6 displays it rotated 90 degrees clockwise
+    result = main.render_platform_image_variants(_jpeg(1600, 800, orientation=6), ['meesho'])
+    assert result['source_size'] == [800, 1600]
+
+    variant = _variant(result, 'meesho', 'main_image')
+    image = Image.open(io.BytesIO(variant['content'])).convert('L')
+    left, top, right, bottom = _content_box(variant)
+    # Displayed portrait: the product is taller than wide, with the bar down the right side
+    assert bottom - top > right - left
+    assert image.getpixel((right - 5, (top + bottom) // 2)) < 64
+    assert 100 < image.getpixel((left + 5, (top + bottom) // 2)) < 160
+
+
+def test_small_sources_are_upscaled_to_the_target_fill():
+    source = Image.new('RGB', (500, 500), (200, 30, 30))
+    buffer = io.BytesIO()
+    source.save(buffer, format='PNG')
+    result = main.render_platform_image_variants(buffer.getvalue(), ['meesho', 'amazon'])
+
+    meesho = _variant(result, 'meesho', 'main_image')
+    left, top, right, bottom = _content_box(meesho)
+    assert meesho['upscaled']
+    assert abs((right - left) - 800 * main.IMAGE_TARGET_FILL) <= 4
+
+    # 2000px would need 3.4x; the upscale limit keeps it at 2x
+    amazon = _variant(result, 'amazon', 'main_image')
+    left, top, right, bottom = _content_box(amazon)
+    assert amazon['upscaled']
+    assert abs((right - left) - 500 * main.IMAGE_MAX_UPSCALE) <= 4
+
+
+def test_large_sources_fill_the_canvas_without_upscaling():
+    result = main.render_platform_image_variants(_jpeg(3000, 3000), ['flipkart'])
+    for variant in result['variants']:
+        assert not variant['upscaled']
+        left, top, right, bottom = _content_box(variant)
+        assert right - left >= variant['width'] - 2
+
+
+def test_process_pool_workers_are_spawned():
+    pool = main.get_image_process_pool()
+    assert pool._mp_context.get_start_method() == 'spawn'
+
+    result = pool.submit(main.render_platform_image_variants, _jpeg(400, 300), ['meesho']).result(timeout=120)
+    assert [variant['width'] for variant in result['variants']] == [800, 600]
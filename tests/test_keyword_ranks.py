@@ -0,0 +1,102 @@
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+import main
+
+TODAY = date.today()
+
+
+def _record_days(keywords, platform, days):
+    """Record StubRankSource observations for each of the last `days` days; returns the daily frame"""
+    source = main.StubRankSource()
+    rows = []
+    for offset in range(days, -1, -1):
+        day = (TODAY - timedelta(days=offset)).isoformat()
+        observations = source.fetch_ranks(platform, keywords, day)
+        main.record_keyword_ranks(platform, observations, day)
+        rows.extend(dict(fields, keyword=keyword, day=day) for keyword, fields in observations.items())
+    return pd.DataFrame(rows)
+
+
+def _expected_rollups(daily, keyword, period):
+    frame = daily[daily['keyword'] == keyword].copy()
+    frame['period_start'] = frame['day'].map(lambda day: main._period_start(day, period))
+    return frame.groupby('period_start').agg(
+        samples=('rank', 'size'), rank=('rank', 'mean'), rank_best=('rank', 'min'),
+        rank_worst=('rank', 'max'), search_volume=('search_volume', 'mean'))
+
+
+def test_daily_history_returns_every_recorded_day():
+    daily = _record_days(['steel bottle'], 'amazon', 40)
+    history = main.get_keyword_rank_history('Steel  Bottle', 'amazon', 'day', days=90)
+
+    assert [row['period_start'] for row in history] == list(daily['day'])
+    assert [row['rank'] for row in history] == list(daily['rank'])
+    assert all(row['samples'] == 1 for row in history)
+
+
+@pytest.mark.parametrize('period', main.KEYWORD_ROLLUP_PERIODS)
+def test_rollups_match_daily_rows(period):
+    daily = _record_days(['cotton kurta', 'yoga mat'], 'flipkart', 75)
+
+    for keyword in ('cotton kurta', 'yoga mat'):
+        expected = _expected_rollups(daily, keyword, period)
+        history = main.get_keyword_rank_history(keyword, 'flipkart', period, days=365)
+        assert [row['period_start'] for row in history] == list(expected.index)
+        for row, (_, want) in zip(history, expected.iterrows()):
+            assert row['samples'] == want['samples']
+            assert row['rank'] == pytest.approx(want['rank'], abs=0.005)
+            assert row['rank_best'] == want['rank_best']
+            assert row['rank_worst'] == want['rank_worst']
+            assert row['search_volume'] == pytest.approx(round(want['search_volume']))
+
+
+def test_recollecting_a_day_keeps_rollups_exact():
+    day = TODAY.isoformat()
+    main.record_keyword_ranks('meesho', {'desk lamp': {'rank': 40, 'search_volume': 100}}, day)
+    main.record_keyword_ranks('meesho', {'desk lamp': {'rank': 10, 'search_volume': 300}}, day)
+
+    week = main.get_keyword_rank_history('desk lamp', 'meesho', 'week', days=1)[-1]
+    assert week['samples'] == 1
+    assert (week['rank'], week['rank_best'], week['rank_worst'], week['search_volume']) == (10, 10, 10, 300)
+
+
+def test_week_and_month_buckets_start_on_monday_and_the_first():
+    _record_days(['wall clock'], 'amazon', 20)
+    for row in main.get_keyword_rank_history('wall clock', 'amazon', 'week', days=30):
+        assert date.fromisoformat(row['period_start']).weekday() == 0
+    for row in main.get_keyword_rank_history('wall clock', 'amazon', 'month', days=30):
+        assert date.fromisoformat(row['period_start']).day == 1
+
+
+def test_unknown_resolution_is_rejected():
+    with pytest.raises(ValueError):
+        main.get_keyword_rank_history('wall clock', 'amazon', 'hour')
+
+
+def test_previous_rank_and_trending_against_stub_source():
+    today_ranks = main.StubRankSource().fetch_ranks('amazon', ['rising mug', 'steady mug'], TODAY.isoformat())
+    yesterday = (TODAY - timedelta(days=1)).isoformat()
+    main.record_keyword_ranks('amazon', {
+        'rising mug': {'rank': today_ranks['rising mug']['rank'] + 5},
+        'steady mug': {'rank': today_ranks['steady mug']['rank']}
+    }, yesterday)
+
+    rankings = main.track_keyword_rankings(['Rising Mug', 'steady mug'], ['amazon'])['rankings']['amazon']
+
+    rising, steady = rankings['rising mug'], rankings['steady mug']
+    assert rising['current_rank'] == today_ranks['rising mug']['rank']
+    assert rising['previous_rank'] == today_ranks['rising mug']['rank'] + 5
+    assert rising['trending'] is True
+    assert steady['previous_rank'] == steady['current_rank']
+    assert steady['trending'] is False
+
+
+def test_first_observation_has_no_previous_rank():
+    rankings = main.track_keyword_rankings(['brand new keyword'], ['meesho'])['rankings']['meesho']
+    entry = rankings['brand new keyword']
+    assert entry['current_rank'] is not None
+    assert entry['previous_rank'] is None
+    assert entry['trending'] is False
@@ -0,0 +1,108 @@
+import csv
+import io
+
+import openpyxl
+import pytest
+
+import main
+
+BULLETS = ['Food-grade 304 stainless steel', 'Keeps drinks cold for 24 hours', 'Leak-proof lid']
+
+
+def _version(version, title):
+    return {'version': version, 'title': title, 'description': 'Insulated steel bottle for daily use.',
+            'bulletPoints': BULLETS, 'hsnCode': '7323', 'keywords': ['steel bottle', 'water bottle']}
+
+
+def _issues(marketplace, versions, rule=None):
+    issues = main.lint_listing_rows(marketplace, main.normalize_listing_versions(versions))
+    return [issue for issue in issues if rule is None or issue['rule'] == rule]
+
+
+@pytest.mark.parametrize('fields', [
+    {'title': 'ISI Certified Stainless Steel Bottle'},
+    {'description': 'We offer a 1 year warranty on the lid.'},
+    {'bulletPoints': BULLETS + ['BPA free, eco-friendly build']},
+    {'keywords': ['discount bottle', 'sale']},
+])
+def test_context_dependent_words_are_warnings(fields):
+    issues = _issues('amazon', [dict(_version(1, 'Steel Bottle 1L'), **fields)])
+    assert [issue['severity'] for issue in issues if issue['rule'] in ('banned_words', 'caution_words')] == ['warning']
+    assert not [issue for issue in issues if issue['severity'] == 'error']
+
+
+@pytest.mark.parametrize('title, word', [
+    ('Steel Bottle - Free Shipping', 'free shipping'),
+    ('#1 Steel Bottle', '#1'),
+    ('Best Seller Steel Bottle', 'best seller'),
+    ('Steel Bottle, Buy Now', 'buy now'),
+])
+def test_promotional_phrases_are_errors(title, word):
+    issues = _issues('amazon', [_version(1, title)], 'banned_words')
+    assert [issue['severity'] for issue in issues] == ['error']
+    assert word in issues[0]['message']
+
+
+def test_caution_word_inside_banned_phrase_is_reported_once():
+    issues = _issues('amazon', [_version(1, 'Steel Bottle Limited Time Offer')])
+    assert [(issue['rule'], issue['severity']) for issue in issues] == [('banned_words', 'error')]
+
+
+def test_marketplace_specific_words():
+    assert _issues('meesho', [_version(1, 'Steel Bottle, order on WhatsApp')], 'banned_words')
+    assert not _issues('flipkart', [_version(1, 'ISI Certified Steel Bottle')], 'caution_words')
+
+
+EXPORT_VERSIONS = [
+    _version(1, 'Steel Bottle 1L'),
+    _version(2, 'Steel Bottle - Free Shipping'),
+    _version(3, 'ISI Certified Steel Bottle'),
+]
+
+
+def _csv_rows(response):
+    return list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+
+
+def test_export_reject_drops_only_rows_with_errors(client):
+    response = client.post('/api/export/flipkart', json={'listing': EXPORT_VERSIONS, 'validation': 'reject'})
+    assert response.status_code == 200
+    assert response.headers['X-Validation-Rejected-Rows'] == '1'
+    assert response.headers['X-Validation-Errors'] == '1'
+
+    rows = _csv_rows(response)
+    assert [row[0] for row in rows[1:]] == ['1', '3']
+
+
+def test_export_reject_with_every_row_failing(client):
+    response = client.post('/api/export/flipkart', json={'listing': [_version(1, 'Buy Now Steel Bottle')],
+                                                         'validation': 'reject'})
+    assert response.status_code == 422
+    assert response.get_json()['validation']['rowsWithErrors'] == 1
+
+
+def test_export_flag_annotates_rows(client):
+    response = client.post('/api/export/flipkart', json={'listing': EXPORT_VERSIONS, 'validation': 'flag'})
+    assert response.status_code == 200
+
+    header, *rows = _csv_rows(response)
+    assert header[-1] == 'Validation Issues'
+    assert len(rows) == 3
+    assert rows[0][-1] == ''
+    assert rows[1][-1].startswith('error: Contains banned words: free shipping')
+
+
+def test_export_flag_in_xlsx_marks_warnings(client):
+    response = client.post('/api/export/amazon', json={'listing': EXPORT_VERSIONS, 'validation': 'flag'})
+    assert response.status_code == 200
+    assert response.headers['X-Validation-Warnings'] == '1'
+
+    sheet = openpyxl.load_workbook(io.BytesIO(response.data)).active
+    values = list(sheet.iter_rows(values_only=True))
+    assert values[0][-1] == 'Validation Issues'
+    assert values[3][-1].startswith('warning: Check the claim or wording: certified')
+
+
+def test_export_rejects_unknown_validation_mode(client):
+    response = client.post('/api/export/flipkart', json={'listing': EXPORT_VERSIONS, 'validation': 'strict'})
+    assert response.status_code == 400
@@ -0,0 +1,81 @@
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+import main
+
+TODAY = date.today()
+
+
+def _days_ago(days):
+    return (TODAY - timedelta(days=days)).isoformat()
+
+
+def _rebuild_from_scratch():
+    """Drop the refresh watermark so backdated rows are aggregated on the next refresh"""
+    main.get_db().execute("DELETE FROM materialized_state WHERE name = 'market_category_daily'")
+
+
+def _store(kind, payload, days_ago=0):
+    object_id = main.save_stored_object(kind, payload)
+    created_at = (datetime.now() - timedelta(days=days_ago)).isoformat()
+    connection = main.get_db()
+    connection.execute('UPDATE stored_objects SET created_at = ? WHERE id = ?', (created_at, object_id))
+    connection.commit()
+
+
+def test_collection_gaps_are_not_weekday_dips():
+    days = pd.date_range('2026-01-05', periods=28)
+    # Flat demand, but nothing was collected on Sundays
+    series = pd.Series(np.where(days.dayofweek == 6, np.nan, 100.0), index=days)
+
+    seasonality = main.decompose_seasonality(series)
+    effects = seasonality['weekday_effect']
+    assert effects.pop('Sun') is None
+    assert all(abs(effect) < 1 for effect in effects.values())
+    assert seasonality['trend_change_pct'] == 0
+
+
+def test_too_few_observed_days_gives_no_seasonality():
+    days = pd.date_range('2026-01-05', periods=30)
+    series = pd.Series(np.nan, index=days)
+    series.iloc[::3] = 50.0
+    assert series.notna().sum() < main.MARKET_SEASONAL_MIN_DAYS
+    assert main.decompose_seasonality(series) is None
+
+
+def test_keyword_volume_is_not_summed_across_platforms():
+    main.track_keywords_for_platforms(['enamel mug'], ['amazon', 'flipkart'], category='Drinkware')
+    main.record_keyword_ranks('amazon', {'enamel mug': {'rank': 6, 'search_volume': 500}}, _days_ago(8))
+    main.record_keyword_ranks('flipkart', {'enamel mug': {'rank': 8, 'search_volume': 400}}, _days_ago(8))
+    main.record_keyword_ranks('amazon', {'enamel mug': {'rank': 4, 'search_volume': 1000}}, TODAY.isoformat())
+    main.record_keyword_ranks('flipkart', {'enamel mug': {'rank': 9, 'search_volume': 800}}, TODAY.isoformat())
+    _rebuild_from_scratch()
+    main.refresh_market_aggregates(force=True)
+
+    trends = main.compute_market_trends('Drinkware', 7)
+    daily = {row['day']: row['search_volume'] for row in trends['volume_trend']['daily']}
+    assert daily[TODAY.isoformat()] == 1000
+    assert daily[_days_ago(1)] is None
+    assert trends['trending_keywords'] == [{'keyword': 'enamel mug', 'growth': '+100%', 'growth_pct': 100.0, 'volume': 1000}]
+    assert trends['volume_trend']['previous'] == 500
+
+    row = main.get_db().execute("SELECT keywords, avg_rank FROM market_category_daily WHERE category = 'Drinkware' AND day = ?",
+                                (TODAY.isoformat(),)).fetchone()
+    assert (row['keywords'], row['avg_rank']) == (1, 6.5)
+
+
+def test_old_prices_follow_a_changed_hsn_category():
+    _rebuild_from_scratch()
+    _store('listing', [{'title': 'Copper bottle', 'category': 'Kitchen', 'hsnCode': '7418'}], days_ago=5)
+    _store('pricing', {'amazon': {'sellingPrice': 900, 'hsnCode': '7418'}}, days_ago=5)
+    main.refresh_market_aggregates(force=True)
+    assert main.compute_market_trends('Kitchen', 7)['price_trends']['average_selling_price'] == 900
+
+    # Newer listings move the HSN code to another category; the five-day-old price follows it
+    for _ in range(2):
+        _store('listing', [{'title': 'Copper jug', 'category': 'Copperware', 'hsnCode': '7418'}])
+    main.refresh_market_aggregates(force=True)
+    assert main.compute_market_trends('Kitchen', 7)['price_trends']['average_selling_price'] is None
+    assert main.compute_market_trends('Copperware', 7)['price_trends']['average_selling_price'] == 900
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+import main
+
+PRICING_CASES = [
+    {'costPrice': 250, 'profitMargin': 42.5, 'hsnCode': '6109', 'weight': 0.3},
+    {'costPrice': 999, 'profitMargin': 20, 'hsnCode': '8517', 'weight': 1.0},
+    {'costPrice': 75.5, 'profitMargin': 60, 'hsnCode': '0401', 'weight': 0.2, 'length': 40, 'width': 30, 'height': 10},
+    {'costPrice': 4200, 'profitMargin': 15, 'hsnCode': '9403', 'weight': 7.25},
+    {'costPrice': 1, 'profitMargin': 0, 'hsnCode': '9999', 'weight': 0},
+]
+
+
+@pytest.mark.parametrize('case', PRICING_CASES)
+def test_solver_inverts_calculate_price(client, case):
+    priced = client.post('/api/calculate-price', json=case).get_json()['data']
+    items = [dict(case, targetPrice=priced[platform]['sellingPrice']) for platform in priced]
+    solved = main.solve_platform_margins(items)
+
+    for row, platform in zip(solved.to_dict('records'), priced):
+        # The selling price is rounded to paise, so allow for that in the margin
+        assert row[f'{platform}ShippingCost'] == pytest.approx(priced[platform]['shippingCost'])
+        assert row[f'{platform}Margin'] == pytest.approx(case['profitMargin'], abs=0.5 / case['costPrice'] + 0.01)
+        assert row[f'{platform}MaxCostPrice'] == pytest.approx(case['costPrice'], abs=0.02)
+        assert row[f'{platform}BreakEvenCost'] >= row[f'{platform}MaxCostPrice']
+
+
+def test_solver_reports_missing_cost_price_as_unknown_margin():
+    solved = main.solve_platform_margins([{'targetPrice': 500, 'hsnCode': '6109'}])
+    assert np.isnan(solved.loc[0, 'amazonMargin'])
+    assert solved.loc[0, 'amazonBreakEvenCost'] > 0
+
+
+def test_sweep_grid_size_does_not_wrap_around(client):
+    # 65536 ** 4 == 2 ** 64, which a numpy int64 product wraps to 0
+    full_range = {'start': 0, 'stop': 65535, 'step': 1}
+    response = client.post('/api/pricing-sweep', json={
+        'costPrice': 100, 'weight': full_range, 'length': full_range, 'width': full_range, 'height': full_range})
+    assert response.status_code == 400
+    assert f'{2 ** 64} points' in response.get_json()['error']
+
+
+def test_sweep_hsn_codes_are_deduplicated_and_capped(client, monkeypatch):
+    looked_up = []
+    monkeypatch.setattr(main, 'get_gst_rate_from_hsn', lambda code: looked_up.append(code) or (0.12, 'test'))
+
+    response = client.post('/api/pricing-sweep', json={'costPrice': 100, 'hsnCodes': ['6109', 6109, '6109', '8517']})
+    data = response.get_json()['data']
+    assert data['hsnCodes'] == ['6109', '8517']
+    assert data['points'] == 2
+    assert sorted(looked_up) == ['6109', '8517']
+
+    looked_up.clear()
+    codes = [str(1000 + i) for i in range(main.MAX_SWEEP_HSN_CODES + 1)]
+    response = client.post('/api/pricing-sweep', json={'costPrice': 100, 'hsnCodes': codes})
+    assert response.status_code == 400
+    assert looked_up == []
+
+    response = client.post('/api/pricing-sweep', json={'costPrice': 100, 'hsnCodes': '6109'})
+    assert response.status_code == 400
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+import main
+
+
+def test_rate_card_slab_lookup_vectorised_matches_scalar():
+    rate_card = main.compile_rate_card(main.DEFAULT_RATE_CARD)
+    # Slab edges, points either side of them and weights past the last slab
+    weights = np.array([0, 0.1, 0.5, 0.5001, 0.99, 1, 1.5, 2, 2.0001, 2.5, 3, 10.75])
+    vectorised = main.calculate_marketplace_shipping_vectorized(weights, rate_card)
+
+    for platform in rate_card['shipping']:
+        scalar = [main.calculate_shipping_from_rate_card(platform, weight, rate_card)['average'] for weight in weights]
+        np.testing.assert_allclose(vectorised[platform], scalar)
+
+
+def test_rate_card_slab_boundaries():
+    rate_card = main.compile_rate_card(main.DEFAULT_RATE_CARD)
+    amazon = main.DEFAULT_RATE_CARD['shipping']['amazon']
+
+    # maxWeight is inclusive
+    assert main.calculate_shipping_from_rate_card('amazon', 0.5, rate_card)['local'] == amazon['slabs'][0]['local']
+    assert main.calculate_shipping_from_rate_card('amazon', 0.51, rate_card)['local'] == amazon['slabs'][1]['local']
+    # Beyond the last slab every extra kg is charged at additionalPerKg
+    beyond = main.calculate_shipping_from_rate_card('amazon', 3.5, rate_card)
+    assert beyond['national'] == amazon['slabs'][-1]['national'] + 1.5 * amazon['additionalPerKg']['national']
+    assert beyond['average'] == pytest.approx(np.mean([beyond['local'], beyond['regional'], beyond['national']]), abs=0.01)
+    # A named average zone is used as is
+    flipkart = main.calculate_shipping_from_rate_card('flipkart', 0.7, rate_card)
+    assert flipkart['average'] == flipkart['regional']
+
+
+def _card_with(**amazon_changes):
+    card = {
+        'commission': {'amazon': 0.15},
+        'shipping': {'amazon': dict(main.DEFAULT_RATE_CARD['shipping']['amazon'])}
+    }
+    card['shipping']['amazon'].update(amazon_changes)
+    return card
+
+
+@pytest.mark.parametrize('card, message', [
+    (_card_with(slabs=[{'maxWeight': 1, 'local': 1, 'regional': 2, 'national': 3},
+                       {'maxWeight': 1, 'local': 1, 'regional': 2, 'national': 3}]), 'increasing maxWeight'),
+    (_card_with(slabs=[{'maxWeight': 1, 'local': -1, 'regional': 2, 'national': 3}]), 'must not be negative'),
+    (_card_with(slabs=[{'maxWeight': 1, 'local': 1, 'regional': 2}]), 'needs maxWeight'),
+    (_card_with(slabs=[]), 'at least one slab'),
+    (_card_with(average='cheapest'), 'average'),
+    (_card_with(additionalPerKg={'local': 1}), 'additionalPerKg'),
+    (dict(_card_with(), commission={'amazon': 1.0}), 'Commission for amazon'),
+    (dict(_card_with(), commission={'flipkart': 0.1}), 'No commission rate'),
+])
+def test_compile_rate_card_rejects_invalid_cards(card, message):
+    with pytest.raises(ValueError, match=message):
+        main.compile_rate_card(card)
@@ -0,0 +1,70 @@
+from datetime import datetime
+import random
+
+import pytest
+
+import main
+
+
+def test_aspect_complaints_are_not_dropped_as_mixed():
+    reviews = (['Poor quality, returned it.'] * 50 + ['Bad quality material'] * 30
+               + ['Waste of money'] * 10 + ['good product'] * 5)
+    result = main.analyze_review_sentiment(reviews)
+
+    assert result['common_complaints'][:3] == ['poor quality', 'bad quality material', 'waste of money']
+    assert result['positive_highlights'] == []
+    assert result['improvement_opportunities'][0] == 'Upgrade materials and add quality checks before dispatch'
+    assert result['negative_percentage'] > 90
+
+
+@pytest.mark.parametrize('review, complaint, praise', [
+    ('Stopped working after a week', 'stopped working', None),
+    ('Not working at all', 'not working', None),
+    ('Not worth the money', 'not worth', None),
+    ('Great value for money', None, 'great value'),
+    ('Good quality, fits well', None, 'good quality'),
+    ('Not bad at all', None, 'not bad'),
+    ('Terrible good', None, None),
+])
+def test_phrase_side_follows_net_weight(review, complaint, praise):
+    result = main.analyze_review_sentiment([review] * 5)
+    assert result['common_complaints'] == ([complaint] if complaint else [])
+    assert result['positive_highlights'] == ([praise] if praise else [])
+
+
+def test_candidate_limit_does_not_change_top_phrases():
+    rng = random.Random(5)
+    words = list(main.SENTIMENT_LEXICON) + [f'word{i}' for i in range(300)] + ['not', 'very', 'the', '.']
+    reviews = [' '.join(rng.choice(words) for _ in range(rng.randint(3, 15))) for _ in range(3000)]
+    codes, vocabulary, _ = main.tokenize_reviews(reviews)
+    weights, negated = main.score_review_tokens(codes, vocabulary)
+
+    everything = main.count_sentiment_phrases(codes, vocabulary, weights, negated)
+    limited = main.count_sentiment_phrases(codes, vocabulary, weights, negated, limit=main.REVIEW_PHRASE_CANDIDATES)
+    for polarity in (-1, 1):
+        assert ([phrase['count'] for phrase in main.select_top_phrases(limited[polarity])]
+                == [phrase['count'] for phrase in main.select_top_phrases(everything[polarity])])
+
+
+@pytest.mark.parametrize('review, day', [
+    ({'date': 'last week', 'createdAt': '2026-03-04T10:00:00'}, '2026-03-04'),
+    ({'date': 'NaT', 'reviewDate': '2026-03-05'}, '2026-03-05'),
+    ({'date': float('nan')}, '2026-01-01'),
+    ({'date': '2026-02-30'}, '2026-01-01'),
+    ('No date at all', '2026-01-01'),
+])
+def test_review_day_skips_unusable_dates(review, day):
+    assert main._review_day(review, '2026-01-01') == day
+
+
+def test_stored_reviews_never_land_on_an_invalid_day(client):
+    reviews = [{'text': 'Poor quality, returned it.', 'date': 'nan'},
+               {'text': 'Good quality, fits well', 'date': 'soon', 'createdAt': '2026-03-04'}]
+    response = client.post('/api/analyze-reviews', json={'productId': 'day-check', 'reviews': reviews})
+    data = response.get_json()['data']
+    assert data['newReviews'] == 2
+    assert data['phraseCounts'] == {'approximate': True, 'perBatchLimit': main.REVIEW_DAILY_PHRASES}
+
+    days = {row['review_day'] for row in main.get_db().execute(
+        "SELECT review_day FROM review_corpus WHERE product_id = 'day-check'")}
+    assert days == {datetime.now().date().isoformat(), '2026-03-04'}
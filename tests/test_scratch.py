@@ -0,0 +1,101 @@
+import threading
+import zipfile
+
+import pytest
+
+import main
+
+
+def test_usage_reporting_does_not_block_concurrent_writes():
+    scratch = main.create_scratch_file()
+    stop = threading.Event()
+
+    def poll_usage():
+        while not stop.is_set():
+            main.get_scratch_usage()
+
+    pollers = [threading.Thread(target=poll_usage) for _ in range(2)]
+    for poller in pollers:
+        poller.start()
+    try:
+        # Small writes keep resizing the in-memory buffer while the usage is polled
+        for _ in range(20000):
+            scratch.write(b'x' * 64)
+    finally:
+        stop.set()
+        for poller in pollers:
+            poller.join()
+
+    assert scratch.size_bytes() == 20000 * 64
+    scratch.close()
+
+
+def test_sizes_track_seeks_and_truncation():
+    scratch = main.create_scratch_file()
+    scratch.write(b'a' * 100)
+    scratch.seek(10)
+    scratch.write(b'b' * 10)
+    assert scratch.size_bytes() == 100
+    scratch.seek(150)
+    scratch.write(b'c')
+    assert scratch.size_bytes() == 151
+    scratch.truncate(40)
+    assert scratch.size_bytes() == 40
+    scratch.close()
+    assert scratch.size_bytes() == 0
+
+
+def test_spilled_files_are_counted_until_closed(monkeypatch):
+    monkeypatch.setattr(main, 'SCRATCH_SPILL_THRESHOLD', 1024)
+    before = main.get_scratch_usage()['diskBytes']
+
+    scratch = main.create_scratch_file()
+    scratch.write(b'x' * 4000)
+    assert scratch.on_disk()
+    scratch.write(b'y' * 1000)
+    assert main.get_scratch_usage()['diskBytes'] == before + 5000
+
+    scratch.close()
+    assert main.get_scratch_usage()['diskBytes'] == before
+
+
+def test_quota_applies_to_writes_after_rollover(monkeypatch):
+    monkeypatch.setattr(main, 'SCRATCH_SPILL_THRESHOLD', 1024)
+    monkeypatch.setattr(main, 'SCRATCH_DISK_QUOTA', main.get_scratch_usage()['diskBytes'] + 10000)
+
+    scratch = main.create_scratch_file()
+    scratch.write(b'x' * 2000)
+    assert scratch.on_disk()
+    scratch.write(b'x' * 7000)
+    with pytest.raises(OSError, match='quota'):
+        scratch.write(b'x' * 2000)
+    # Rewriting existing bytes does not grow the file
+    scratch.seek(0)
+    scratch.write(b'z' * 9000)
+    assert scratch.size_bytes() == 9000
+    scratch.close()
+
+
+def test_quota_applies_at_rollover(monkeypatch):
+    monkeypatch.setattr(main, 'SCRATCH_SPILL_THRESHOLD', 1024)
+    monkeypatch.setattr(main, 'SCRATCH_DISK_QUOTA', main.get_scratch_usage()['diskBytes'] + 1500)
+
+    scratch = main.create_scratch_file()
+    with pytest.raises(OSError, match='quota'):
+        scratch.write(b'x' * 2000)
+    assert not scratch.on_disk()
+    scratch.close()
+
+
+def test_zip_written_through_a_spilled_scratch_file(monkeypatch):
+    monkeypatch.setattr(main, 'SCRATCH_SPILL_THRESHOLD', 4096)
+    scratch = main.create_scratch_file(suffix='.zip')
+    with zipfile.ZipFile(scratch, 'w', zipfile.ZIP_STORED) as archive:
+        for i in range(5):
+            archive.writestr(f'file{i}.bin', bytes(range(256)) * 20)
+
+    assert scratch.on_disk()
+    scratch.seek(0)
+    with zipfile.ZipFile(scratch) as archive:
+        assert archive.read('file3.bin') == bytes(range(256)) * 20
+    scratch.close()